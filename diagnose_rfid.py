@@ -8,12 +8,82 @@ RFID通信诊断脚本
 import asyncio
 import can
 import logging
+import selectors
+import struct
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
+try:
+    # 主应用在同一进程内时通过共享实例挂接监听器，而不是再开一条总线
+    from feeder_cabinet.can_communication import FeederCabinetCAN
+except ImportError:
+    FeederCabinetCAN = None
+
+
+class BatchLogHandler(logging.Handler):
+    """批量日志处理器
+
+    emit只做一次deque追加，由后台线程成批写出，
+    避免每帧多条日志在CAN接收路径上同步写stderr。
+    写出时机：距上次写出超过flush_interval，或积压达到batch_size
+    （提前唤醒写线程）。队列有界，溢出时丢弃最旧记录。
+    """
+
+    def __init__(self, stream=None, flush_interval=0.05, batch_size=128, maxlen=1024):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = deque(maxlen=maxlen)
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._writer = threading.Thread(target=self._drain_loop, daemon=True)
+        self._writer.start()
+
+    def emit(self, record):
+        try:
+            self._queue.append(self.format(record))
+            if len(self._queue) >= self.batch_size:
+                self._wake_event.set()
+        except Exception:
+            self.handleError(record)
+
+    def _drain_loop(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_interval)
+            self._wake_event.clear()
+            self._flush_batch()
+        self._flush_batch()
+
+    def _flush_batch(self):
+        queue = self._queue
+        if not queue:
+            return
+        lines = []
+        while queue:
+            try:
+                lines.append(queue.popleft())
+            except IndexError:
+                break
+        self.stream.write('\n'.join(lines) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self._writer.join(timeout=1.0)
+        self._flush_batch()
+        super().close()
+
+
 # 配置日志
 logging.basicConfig(
     level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[BatchLogHandler()]
 )
 logger = logging.getLogger(__name__)
 
@@ -23,20 +93,73 @@ CMD_RFID_DATA_PACKET = 0x17
 CMD_RFID_DATA_END = 0x18
 CMD_RFID_READ_ERROR = 0x19
 
+# 帧结构定义（大端），一次C调用解出整帧字段
+_START_PKT = struct.Struct('>BBBBHBB')  # 命令/序列号/通道/总包数/数据长度/挤出机/数据源
+_END_PKT = struct.Struct('>BBBHB')      # 命令/序列号/总包数/校验和/状态
+_ERROR_PKT = struct.Struct('>BBBBB')    # 命令/序列号/挤出机/错误码/扩展错误
+
+# 错误码与命令名映射（模块级常量，避免每帧重建字典）
+_RFID_ERROR_MAP = {
+    0x01: "RFID读取失败",
+    0x02: "无耗材或未检测到",
+    0x03: "数据格式无效",
+    0x04: "操作超时",
+    0x05: "无挤出机映射",
+    0x06: "系统忙"
+}
+
+_CMD_NAME = {
+    0x14: "起始包",
+    0x17: "数据包",
+    0x18: "结束包",
+    0x19: "错误包"
+}
+
+
+class RFIDSession:
+    """RFID传输会话记录
+
+    使用__slots__的槽位属性代替字典，按属性偏移访问，
+    省去每包一次的字符串哈希与字典查找。
+    """
+    __slots__ = ('seq', 'total', 'received', 'start_time')
+
+    def __init__(self, seq, total):
+        self.seq = seq
+        self.total = total
+        self.received = 0
+        self.start_time = time.monotonic()
+
 
 class RFIDDiagnostic:
     def __init__(self, interface='can1'):
         self.interface = interface
         self.bus = None
         self.rfid_session = None
-        
+        self._hub = None          # 进程内共享的FeederCabinetCAN实例
+        self._hub_reader = None   # 挂接到共享实例上的帧缓冲
+
     def connect(self):
         """连接到CAN总线"""
+        # 进程内已有同接口的共享实例时，挂接一个帧缓冲监听器复用
+        # 其总线：同一接口不开第二个socket，也不会与主应用抢帧
+        if FeederCabinetCAN is not None:
+            hub = FeederCabinetCAN.get_instance(interface=self.interface)
+            if hub.connected:
+                reader = can.BufferedReader()
+                if hub.add_listener(reader):
+                    self._hub = hub
+                    self._hub_reader = reader
+                    logger.info(f"已挂接到进程内共享CAN实例: {self.interface}")
+                    return True
         try:
             self.bus = can.interface.Bus(
                 channel=self.interface,
                 bustype='socketcan',
-                bitrate=1000000
+                bitrate=1000000,
+                # 内核侧过滤：只接收送料柜->打印机(0x10B)的帧，
+                # 其余总线流量在socketcan层即被丢弃
+                can_filters=[{"can_id": 0x10B, "can_mask": 0x7FF, "extended": False}]
             )
             logger.info(f"已连接到CAN接口: {self.interface}")
             return True
@@ -44,102 +167,132 @@ class RFIDDiagnostic:
             logger.error(f"连接CAN失败: {e}")
             return False
             
+    def _on_start_packet(self, data) -> int:
+        """处理起始包"""
+        (_, seq, channel, total_packets,
+         data_len, extruder, source) = _START_PKT.unpack_from(data)
+
+        logger.info(f"  起始包: 序列号={seq}, 通道={channel}, "
+                  f"总包数={total_packets}, 数据长度={data_len}, "
+                  f"挤出机={extruder}, 数据源={'RFID' if source==0 else '手动'}")
+
+        self.rfid_session = RFIDSession(seq, total_packets)
+        return 0
+
+    def _on_data_packet(self, data) -> int:
+        """处理数据包，返回计入统计的包数"""
+        seq = data[1]
+        packet_num = data[2]
+        valid_bytes = data[3]
+
+        logger.info(f"  数据包: 序列号={seq}, 包号={packet_num}, "
+                  f"有效字节={valid_bytes}")
+
+        # 局部绑定会话对象，避免对self.rfid_session的重复属性查找
+        sess = self.rfid_session
+        if sess is not None and sess.seq == seq:
+            sess.received += 1
+            return 1
+        return 0
+
+    def _on_end_packet(self, data) -> int:
+        """处理结束包"""
+        _, seq, total, checksum, status = _END_PKT.unpack_from(data)
+
+        logger.info(f"  结束包: 序列号={seq}, 总包数={total}, "
+                  f"校验和=0x{checksum:04X}, 状态={status}")
+
+        sess = self.rfid_session
+        if sess is not None and sess.seq == seq:
+            elapsed = time.monotonic() - sess.start_time
+            logger.info(f"  传输完成: 收到 {sess.received}/{sess.total} 包, "
+                      f"耗时 {elapsed:.2f} 秒")
+            self.rfid_session = None
+        return 0
+
+    def _on_error_packet(self, data) -> int:
+        """处理错误响应包"""
+        _, seq, extruder, error_code, ext_error = _ERROR_PKT.unpack_from(data)
+
+        error_msg = _RFID_ERROR_MAP.get(error_code, f"未知错误(0x{error_code:02X})")
+        logger.error(f"  错误响应: 挤出机={extruder}, 错误={error_msg}, "
+                   f"扩展错误=0x{ext_error:02X}")
+        return 0
+
+    # 命令分发表：单次字典查找代替链式elif比较，新增命令只需登记一行
+    _RFID_DISPATCH = {
+        CMD_RFID_RAW_DATA_NOTIFY: _on_start_packet,
+        CMD_RFID_DATA_PACKET: _on_data_packet,
+        CMD_RFID_DATA_END: _on_end_packet,
+        CMD_RFID_READ_ERROR: _on_error_packet,
+    }
+
     def monitor_rfid(self, duration=30):
         """监控RFID消息"""
         logger.info(f"开始监控RFID消息，持续 {duration} 秒...")
         logger.info("提示：请在送料柜上触发RFID读取")
         
-        start_time = datetime.now()
+        deadline = time.monotonic() + duration
         packet_count = 0
         rfid_messages = []
-        
-        while (datetime.now() - start_time).seconds < duration:
-            msg = self.bus.recv(timeout=1.0)
+
+        # 自适应等待：帧以约50ms的突发到达，收到一帧后先零超时
+        # 快速探测若干次把同批帧排空，空了再回到阻塞等待
+        selector = None
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(self.bus.socket.fileno(), selectors.EVENT_READ)
+        except (AttributeError, OSError):
+            selector = None
+        burst_budget = 0
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if self._hub_reader is not None:
+                # 共享实例路径：帧由主应用的接收链路分发到挂接的缓冲
+                msg = self._hub_reader.get_message(timeout=min(1.0, deadline - now))
+            elif selector is not None:
+                if burst_budget > 0:
+                    burst_budget -= 1
+                    if not selector.select(timeout=0):
+                        burst_budget = 0
+                        continue
+                elif not selector.select(timeout=min(1.0, deadline - now)):
+                    continue
+                msg = self.bus.recv(timeout=0)
+            else:
+                msg = self.bus.recv(timeout=1.0)
             if msg:
+                if selector is not None:
+                    burst_budget = 8
                 # 检查是否是来自送料柜的消息
                 if msg.arbitration_id == 0x10B:  # 送料柜 -> 打印机
                     if len(msg.data) > 0:
                         cmd = msg.data[0]
                         
                         # 检查是否是RFID相关命令
-                        if cmd in [CMD_RFID_RAW_DATA_NOTIFY, CMD_RFID_DATA_PACKET, 
-                                  CMD_RFID_DATA_END, CMD_RFID_READ_ERROR]:
+                        if cmd in self._RFID_DISPATCH:
+                            # 时间戳字符串仅用于显示，间隔计算使用单调时钟
+                            mono_ns = time.monotonic_ns()
                             timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-                            hex_data = ' '.join([f'{b:02X}' for b in msg.data])
-                            
+                            hex_data = msg.data.hex(' ').upper()  # 单次C调用完成逐字节十六进制格式化
+
                             logger.info(f"[{timestamp}] RFID消息: 0x{cmd:02X} - {hex_data}")
                             rfid_messages.append({
                                 'time': timestamp,
+                                'mono_ns': mono_ns,
                                 'cmd': cmd,
-                                'data': list(msg.data)
+                                'data': bytes(msg.data)  # 不可变单块存储，免去8个int装箱
                             })
                             
-                            # 解析消息
-                            if cmd == CMD_RFID_RAW_DATA_NOTIFY:
-                                seq = msg.data[1]
-                                channel = msg.data[2]
-                                total_packets = msg.data[3]
-                                data_len = (msg.data[4] << 8) | msg.data[5]
-                                extruder = msg.data[6]
-                                source = msg.data[7]
-                                
-                                logger.info(f"  起始包: 序列号={seq}, 通道={channel}, "
-                                          f"总包数={total_packets}, 数据长度={data_len}, "
-                                          f"挤出机={extruder}, 数据源={'RFID' if source==0 else '手动'}")
-                                
-                                self.rfid_session = {
-                                    'seq': seq,
-                                    'total': total_packets,
-                                    'received': 0,
-                                    'start_time': datetime.now()
-                                }
-                                
-                            elif cmd == CMD_RFID_DATA_PACKET:
-                                seq = msg.data[1]
-                                packet_num = msg.data[2]
-                                valid_bytes = msg.data[3]
-                                
-                                logger.info(f"  数据包: 序列号={seq}, 包号={packet_num}, "
-                                          f"有效字节={valid_bytes}")
-                                
-                                if self.rfid_session and self.rfid_session['seq'] == seq:
-                                    self.rfid_session['received'] += 1
-                                    packet_count += 1
-                                    
-                            elif cmd == CMD_RFID_DATA_END:
-                                seq = msg.data[1]
-                                total = msg.data[2]
-                                checksum = (msg.data[3] << 8) | msg.data[4]
-                                status = msg.data[5]
-                                
-                                logger.info(f"  结束包: 序列号={seq}, 总包数={total}, "
-                                          f"校验和=0x{checksum:04X}, 状态={status}")
-                                
-                                if self.rfid_session and self.rfid_session['seq'] == seq:
-                                    duration = (datetime.now() - self.rfid_session['start_time']).total_seconds()
-                                    logger.info(f"  传输完成: 收到 {self.rfid_session['received']}/{self.rfid_session['total']} 包, "
-                                              f"耗时 {duration:.2f} 秒")
-                                    self.rfid_session = None
-                                    
-                            elif cmd == CMD_RFID_READ_ERROR:
-                                seq = msg.data[1]
-                                extruder = msg.data[2]
-                                error_code = msg.data[3]
-                                ext_error = msg.data[4]
-                                
-                                error_map = {
-                                    0x01: "RFID读取失败",
-                                    0x02: "无耗材或未检测到",
-                                    0x03: "数据格式无效",
-                                    0x04: "操作超时",
-                                    0x05: "无挤出机映射",
-                                    0x06: "系统忙"
-                                }
-                                
-                                error_msg = error_map.get(error_code, f"未知错误(0x{error_code:02X})")
-                                logger.error(f"  错误响应: 挤出机={extruder}, 错误={error_msg}, "
-                                           f"扩展错误=0x{ext_error:02X}")
+                            # 解析消息：经分发表直达处理函数，免去命令链式比较
+                            packet_count += self._RFID_DISPATCH[cmd](self, msg.data)
                                 
+        if selector is not None:
+            selector.close()
+
         # 总结
         logger.info("\n=== RFID监控总结 ===")
         logger.info(f"监控时长: {duration} 秒")
@@ -147,23 +300,18 @@ class RFIDDiagnostic:
         logger.info(f"收到数据包数: {packet_count}")
         
         if self.rfid_session:
-            logger.warning(f"警告: 存在未完成的传输会话 - 序列号{self.rfid_session['seq']}, "
-                         f"收到 {self.rfid_session['received']}/{self.rfid_session['total']} 包")
+            logger.warning(f"警告: 存在未完成的传输会话 - 序列号{self.rfid_session.seq}, "
+                         f"收到 {self.rfid_session.received}/{self.rfid_session.total} 包")
             
         # 分析消息间隔
         if len(rfid_messages) > 1:
             logger.info("\n消息时间分析:")
             for i in range(1, len(rfid_messages)):
-                prev_time = datetime.strptime(rfid_messages[i-1]['time'], '%H:%M:%S.%f')
-                curr_time = datetime.strptime(rfid_messages[i]['time'], '%H:%M:%S.%f')
-                interval = (curr_time - prev_time).total_seconds() * 1000  # 毫秒
+                # 直接用接收时捕获的单调纳秒时间戳做整数减法，
+                # 避免对显示字符串再做strptime解析
+                interval = (rfid_messages[i]['mono_ns'] - rfid_messages[i-1]['mono_ns']) / 1e6  # 毫秒
                 
-                cmd_name = {
-                    0x14: "起始包",
-                    0x17: "数据包",
-                    0x18: "结束包",
-                    0x19: "错误包"
-                }.get(rfid_messages[i]['cmd'], f"未知(0x{rfid_messages[i]['cmd']:02X})")
+                cmd_name = _CMD_NAME.get(rfid_messages[i]['cmd'], f"未知(0x{rfid_messages[i]['cmd']:02X})")
                 
                 logger.info(f"  {rfid_messages[i-1]['time']} -> {rfid_messages[i]['time']}: "
                           f"{interval:.1f}ms ({cmd_name})")
@@ -176,11 +324,21 @@ class RFIDDiagnostic:
             data=[0x20, sequence, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00],  # 假设的确认命令
             is_extended_id=False
         )
-        self.bus.send(msg)
+        bus = self.bus if self.bus is not None else (self._hub.bus if self._hub else None)
+        if bus is None:
+            logger.error("没有可用的CAN总线，无法发送确认消息")
+            return
+        bus.send(msg)
         logger.info(f"发送确认消息: 序列号={sequence}")
         
     def close(self):
         """关闭CAN连接"""
+        if self._hub is not None:
+            # 共享总线归主应用所有，只解除挂接，不关闭
+            self._hub.remove_listener(self._hub_reader)
+            self._hub = None
+            self._hub_reader = None
+            logger.info("已从共享CAN实例解除挂接")
         if self.bus:
             self.bus.shutdown()
             logger.info("CAN连接已关闭")
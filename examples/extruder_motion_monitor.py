@@ -109,9 +109,11 @@ class ExtruderMotionMonitor:
             self.last_motion_state = motion_state
             self.last_active_extruder = active_extruder
         
-        # 记录详细信息（仅调试级别）
-        logger.debug(f"运动详情 - 挤出头: {active_extruder}, 速度: {extruder_velocity:.2f}, "
-                    f"位置: {live_position}")
+        # 记录详细信息（仅调试级别）：live_position的repr开销较大，
+        # 先判断级别再格式化，DEBUG关闭时只付出一次属性检查
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("运动详情 - 挤出头: %s, 速度: %.2f, 位置: %s",
+                         active_extruder, extruder_velocity, live_position)
     
     async def handle_toolhead_update(self, toolhead_data: Dict[str, Any]):
         """处理工具头状态更新"""
@@ -126,8 +128,8 @@ class ExtruderMotionMonitor:
         temperature = extruder_data.get('temperature', 0)
         target_temp = extruder_data.get('target', 0)
         
-        logger.debug(f"{extruder_name}: 温度={temperature:.1f}°C (目标:{target_temp:.1f}°C), "
-                    f"可挤出={can_extrude}")
+        logger.debug("%s: 温度=%.1f°C (目标:%.1f°C), 可挤出=%s",
+                     extruder_name, temperature, target_temp, can_extrude)
     
     async def start_monitoring(self):
         """开始监控"""
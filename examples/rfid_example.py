@@ -21,7 +21,8 @@ class RFIDExample:
     """RFID数据接收示例类"""
     
     def __init__(self):
-        self.can = FeederCabinetCAN(interface='can1', bitrate=1000000)
+        # 共享实例：若主应用已持有同一接口，复用其总线而不是再开一个
+        self.can = FeederCabinetCAN.get_instance(interface='can1', bitrate=1000000)
         self.rfid_parser = RFIDDataParser()
         self.logger = logging.getLogger(__name__)
         
@@ -54,7 +55,8 @@ class RFIDExample:
                                    f"数据源: {result['data_source']}")
                     
                 elif result['type'] == 'rfid_packet':
-                    self.logger.debug(f"接收RFID数据包 {result['packet_num']}/{result['total_packets']}")
+                    self.logger.debug("接收RFID数据包 %s/%s",
+                                      result['packet_num'], result['total_packets'])
                     
                 elif result['type'] == 'rfid_complete':
                     self.logger.info("RFID数据接收完成!")
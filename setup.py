@@ -2,11 +2,29 @@
 """
 送料柜自动续料系统 - 安装脚本
 """
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 with open('README.md', 'r', encoding='utf-8') as f:
     long_description = f.read()
 
+# 可选的Cython发送快路径：有Cython时编译，否则跳过，
+# 运行时can_communication会自动回退到纯Python路径。
+# 不使用-march=native等宿主相关标志，以免污染交叉安装的wheel。
+ext_modules = []
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [Extension(
+            "feeder_cabinet._canfast",
+            ["src/feeder_cabinet/_canfast.pyx"],
+            extra_compile_args=["-O3"],
+        )],
+        language_level=3,
+    )
+except ImportError:
+    pass
+
 setup(
     name="feeder_cabinet",
     version="1.0.0",
@@ -18,6 +36,7 @@ setup(
     url="https://github.com/your-username/feeder_cabinet",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -10,6 +10,10 @@
 
 __version__ = "1.0.0"
 
+# 预导入子模块：后续 from feeder_cabinet.xxx import ... 直接命中
+# sys.modules，也使 feeder_cabinet.xxx 属性访问无需单独导入
+from . import can_communication, klipper_monitor, log_manager  # noqa: F401
+
 # 导出主要的类和函数
 from .main import FeederCabinetApp, main
 from .can_communication import FeederCabinetCAN
@@ -0,0 +1,51 @@
+# cython: language_level=3
+"""
+socketcan发送快路径 - 直接对CAN socket写入struct can_frame
+
+绕过python-can的Message构建和send封装，把8字节经典CAN帧的发送
+压缩为一次write(2)系统调用。编译为可选扩展，导入失败时
+can_communication自动回退到python-can路径。
+"""
+
+from libc.string cimport memset
+from posix.unistd cimport write
+
+
+cdef struct can_frame:
+    unsigned int can_id
+    unsigned char can_dlc
+    unsigned char __pad
+    unsigned char __res0
+    unsigned char __res1
+    unsigned char data[8]
+
+
+def send_frame(int fd, unsigned int can_id, const unsigned char[:] payload):
+    """向socketcan文件描述符写入一个8字节经典CAN帧
+
+    Args:
+        fd: CAN socket的文件描述符
+        can_id: 仲裁ID（标准帧）
+        payload: 最多8字节的数据
+
+    Raises:
+        OSError: 写入失败或不完整
+    """
+    cdef can_frame frame
+    cdef Py_ssize_t i, n
+    cdef ssize_t written
+
+    memset(&frame, 0, sizeof(frame))
+    frame.can_id = can_id
+    frame.can_dlc = 8
+
+    n = payload.shape[0]
+    if n > 8:
+        n = 8
+    for i in range(n):
+        frame.data[i] = payload[i]
+
+    with nogil:
+        written = write(fd, &frame, sizeof(frame))
+    if written != <ssize_t>sizeof(frame):
+        raise OSError("CAN socket写入不完整")
@@ -11,21 +11,140 @@ CAN通信模块 - 管理与送料柜之间的CAN通信 (Asyncio Version)
 import can
 import logging
 import asyncio
+import socket
+import time
 from typing import Optional, Callable, Dict, List, Any, Union, TYPE_CHECKING, Coroutine
 
 if TYPE_CHECKING:
     import can
 
+try:
+    # 可选的Cython发送快路径（见_canfast.pyx），未编译时回退python-can
+    from . import _canfast
+except ImportError:
+    _canfast = None
+
+# 按payload长度预生成的补零片段：_send_frame按索引取用，
+# 发送热路径上不再为补零分配临时bytes
+_FRAME_PADDING = tuple(bytes(8 - i) for i in range(9))
+
+# 耗材类型码表（模块级常量，避免每帧通知重建字典）
+_MATERIAL_TYPES = {
+    0x00: "未知",      # Unknown
+    0x01: "PLA",       # PLA
+    0x02: "PETG",      # PETG
+    0x03: "ABS",       # ABS
+    0x04: "ASA",       # ASA
+    0xFF: "其他"       # Other
+}
+
+
+class _DedupLogger:
+    """重复日志抑制包装器
+
+    总线断开时同一错误可能每秒触发成百上千次，把syslog写满。
+    在时间窗口内对相同(级别, 模板)的连续日志只计数不输出，
+    模板变化或窗口到期时补记一条带重复次数的汇总。
+    调用方需使用%%风格模板以便按模板而非格式化结果去重。
+    """
+
+    def __init__(self, logger: logging.Logger, window: float = 30.0):
+        self._logger = logger
+        self._window = window
+        self._last_key = None
+        self._last_emit = 0.0
+        self._pending = None
+        self._count = 0
+
+    def _log(self, level: int, msg: str, args):
+        now = time.monotonic()
+        key = (level, msg)
+        if key == self._last_key and now - self._last_emit <= self._window:
+            self._count += 1
+            self._pending = (level, msg, args)
+            return
+        self._flush()
+        self._last_key = key
+        self._last_emit = now
+        self._logger.log(level, msg, *args)
+
+    def _flush(self):
+        if self._count and self._pending:
+            level, msg, args = self._pending
+            self._logger.log(level, msg + f" (近期重复 {self._count} 次)", *args)
+        self._count = 0
+        self._pending = None
+
+    def flush(self):
+        """立即输出挂起的重复汇总并重置去重状态
+
+        风暴停止后不再有后续调用触发惰性汇总，连接状态变化
+        （重连成功、主动断开）时由调用方显式冲刷，保证被抑制的
+        日志最终都有记录。
+        """
+        self._flush()
+        self._last_key = None
+
+    def error(self, msg: str, *args):
+        self._log(logging.ERROR, msg, args)
+
+    def warning(self, msg: str, *args):
+        self._log(logging.WARNING, msg, args)
+
+
+class _BoundedAsyncReader(can.AsyncBufferedReader):
+    """有界异步CAN帧缓冲读取器
+
+    基于can.AsyncBufferedReader，但限制缓冲区长度：当缓冲区满时丢弃
+    最旧的帧（环形缓冲区语义），避免消费者停滞时过期状态帧无限堆积。
+    """
+
+    def __init__(self, maxlen: int = 1024, **kwargs):
+        super().__init__(**kwargs)
+        self._maxlen = maxlen
+
+    def on_message_received(self, msg: 'can.Message'):
+        if self.buffer.qsize() >= self._maxlen:
+            try:
+                self.buffer.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        super().on_message_received(msg)
+
+
+class _Callbacks:
+    """回调槽位集合
+
+    用__slots__槽位对象集中存放对外回调：热路径上cb.status是一次
+    按固定偏移的槽位读取（省去实例字典探查），九个回调归属一处，
+    读写关系一目了然。对外注册接口仍是set_*_callback系列方法。
+    """
+
+    __slots__ = ('status', 'query', 'mapping_query', 'mapping_response',
+                 'mapping_set', 'reconnect', 'rfid', 'filament_out', 'low_weight')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+
 class FeederCabinetCAN:
     """送料柜CAN通信类"""
-    
+
+    # 进程内按接口缓存的共享实例（见get_instance）
+    _instances: Dict[str, 'FeederCabinetCAN'] = {}
+
     # 状态码定义
     STATUS_IDLE = 0x00      # 空闲
     STATUS_READY = 0x01     # 就绪/准备送料
     STATUS_FEEDING = 0x02   # 送料中
     STATUS_COMPLETE = 0x03  # 完成
     STATUS_ERROR = 0x04     # 错误
-    
+
+    # 状态帧命令集合：接收帧data[0]落在其中即按状态帧处理
+    _STATUS_COMMANDS = frozenset((STATUS_IDLE, STATUS_READY, STATUS_FEEDING,
+                                  STATUS_COMPLETE, STATUS_ERROR))
+
     # 错误码定义
     ERROR_NONE = 0x00          # 无错误
     ERROR_MECHANICAL = 0x01    # 机械错误
@@ -78,6 +197,8 @@ class FeederCabinetCAN:
         self.bitrate = bitrate
         self.bus: Optional[can.BusABC] = None
         self.logger = logging.getLogger("feeder_cabinet.can")
+        # 发送失败等高频错误路径走去重包装器，防止错误风暴刷爆日志
+        self.dedup_logger = _DedupLogger(self.logger)
         
         # CAN消息ID定义
         self.SEND_ID = 0x10A       # 打印机 -> 送料柜
@@ -86,23 +207,30 @@ class FeederCabinetCAN:
         self.HANDSHAKE_RECEIVE_ID = 0x3F1  # 握手接收ID
         
         # 握手消息定义
-        self.HANDSHAKE_DATA = [0x01, 0xF0, 0x10, 0x00, 0x00, 0x06, 0x01, 0x05]
-        self.HANDSHAKE_RESPONSE = [0x05]  # 送料柜返回0x05表示握手成功
+        # bytes常量：构建can.Message时免去list→bytearray转换，
+        # 响应比对走C层memcmp而不是逐元素的临时list比较
+        self.HANDSHAKE_DATA = bytes((0x01, 0xF0, 0x10, 0x00, 0x00, 0x06, 0x01, 0x05))
+        self.HANDSHAKE_RESPONSE = bytes((0x05,))  # 送料柜返回0x05表示握手成功
         
-        # 状态和回调
+        # 状态和回调（回调集中在槽位对象中，见_Callbacks）
         self.connected = False
-        self.status_callback: Optional[Callable[[Dict], Coroutine]] = None
-        self.query_callback: Optional[Callable[[], Coroutine]] = None
-        self.mapping_query_callback: Optional[Callable[[], Coroutine]] = None
-        self.mapping_response_callback: Optional[Callable[[Dict], Coroutine]] = None
-        self.mapping_set_callback: Optional[Callable[[Dict], Coroutine]] = None
-        self.reconnect_callback: Optional[Callable[[], Coroutine]] = None  # 重连成功回调
-        self.rfid_callback: Optional[Callable[[Dict], Coroutine]] = None  # RFID数据回调
-        self.filament_out_callback: Optional[Callable[[Dict], Coroutine]] = None  # 断料通知回调
-        self.low_weight_callback: Optional[Callable[[Dict], Coroutine]] = None  # 低重量通知回调
+        self.cb = _Callbacks()
         
         # 异步任务和锁
         self.rx_task: Optional[asyncio.Task] = None
+        # RFID帧走有界队列+单个常驻消费任务：突发数据包流不再逐帧
+        # 创建Task，且按到达顺序串行回调；队列满时丢弃最新帧并记录
+        self._rfid_queue: Optional[asyncio.Queue] = None
+        self._rfid_consumer_task: Optional[asyncio.Task] = None
+        # 状态帧同样走有界队列+常驻消费任务：状态回调按到达顺序串行
+        # 执行，不再逐帧创建Task；队列满时丢弃最旧状态（最新优先）
+        self._status_queue: Optional[asyncio.Queue] = None
+        self._status_consumer_task: Optional[asyncio.Task] = None
+        self.rx_reader: Optional[_BoundedAsyncReader] = None
+        self.rx_notifier: Optional[can.Notifier] = None
+        # add_listener挂接的额外监听器：描述符直读路径没有Notifier，
+        # 由_on_can_readable在投递rx_reader后逐个分发
+        self._listeners: List['can.Listener'] = []
         self.auto_reconnect = True  # 启用自动重连
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.send_lock = asyncio.Lock()
@@ -112,43 +240,178 @@ class FeederCabinetCAN:
         self.auto_reconnect = True
         self.reconnect_interval = 5  # seconds
         
-        # 心跳响应监控
-        self.heartbeat_sent_time = 0
-        self.heartbeat_response_received = False
+        # 预构建的发送帧模板：send_message复用同一can.Message和底层
+        # bytearray，只改写命令/挤出机字节，避免每次发送都重新分配
+        self._tx_msg = can.Message(
+            arbitration_id=self.SEND_ID,
+            data=bytes(8),
+            is_extended_id=False
+        )
+        self._tx_buf = self._tx_msg.data
+        self._socket_fd: Optional[int] = None  # socketcan描述符，供接收注册和_canfast快路径使用
+        self._fd_reader_registered = False  # 描述符是否已注册到事件循环
+
+        # 命令去抖：上层突发重复下发同一(命令, 挤出机)时，
+        # 5ms窗口内的重复帧不再落到总线上
+        self._last_cmd = (None, None, 0.0)
+        self._cmd_debounce_window = 0.005  # 秒
+
+        # 稳态状态帧去重：记录上一帧状态的前3字节(状态/进度/错误码)，
+        # 与之相同的帧不再构建status_data也不再调度回调
+        self._last_status_key: Optional[bytes] = None
+
+        # 心跳响应监控：响应帧到达时置位事件，心跳任务即刻被唤醒，
+        # 不必等满超时窗口
+        self._heartbeat_event = asyncio.Event()
         self.heartbeat_timeout = 2  # 心跳响应超时2秒
         self.heartbeat_interval = 3  # 心跳发送间隔3秒
-    
-    async def connect(self) -> bool:
+
+        # 注册到进程内实例表：直接构造的实例（如主应用）同样能被
+        # get_instance发现，诊断工具不会对同一接口再开一条总线
+        self._instances.setdefault(interface, self)
+
+    @classmethod
+    def get_instance(cls, interface: str = 'can0', bitrate: int = 1000000) -> 'FeederCabinetCAN':
+        """
+        获取进程内共享的CAN通信实例
+
+        同一接口在进程内只持有一个实例和一份内核接收缓冲区，
+        主应用与诊断工具可共用总线，通过add_listener挂接额外监听器。
+
+        Args:
+            interface: CAN接口名称
+            bitrate: CAN总线波特率
+
+        Returns:
+            FeederCabinetCAN: 该接口对应的共享实例
+        """
+        instance = cls._instances.get(interface)
+        if instance is None:
+            # 构造函数会自行注册到实例表
+            instance = cls(interface=interface, bitrate=bitrate)
+        return instance
+
+    def add_listener(self, listener: 'can.Listener') -> bool:
+        """
+        向接收通知器追加一个监听器（例如诊断工具的帧记录器）
+
+        Args:
+            listener: can.Listener实例
+
+        Returns:
+            bool: 是否成功挂接（未连接时返回False）
+        """
+        if self.rx_notifier:
+            self.rx_notifier.add_listener(listener)
+            return True
+        if self._fd_reader_registered:
+            self._listeners.append(listener)
+            return True
+        self.logger.error("CAN总线未连接，无法挂接监听器")
+        return False
+
+    def remove_listener(self, listener: 'can.Listener') -> bool:
+        """
+        移除通过add_listener挂接的监听器
+
+        Args:
+            listener: can.Listener实例
+
+        Returns:
+            bool: 是否成功移除
+        """
+        if self.rx_notifier:
+            try:
+                self.rx_notifier.remove_listener(listener)
+                return True
+            except ValueError:
+                return False
+        try:
+            self._listeners.remove(listener)
+            return True
+        except ValueError:
+            return False
+
+    async def connect(self, can_filters: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         连接到CAN总线并执行握手过程
-        
+
+        Args:
+            can_filters: 内核侧接收过滤器列表，None时默认只接收
+                         送料柜消息ID和握手响应ID
+
         Returns:
             bool: 连接和握手是否成功
         """
         if self.connected:
             self.logger.info("已经连接到CAN总线")
             return True
-            
+
         try:
+            if can_filters is None:
+                # 默认在socketcan层过滤：不相关的总线流量不再进入用户态
+                can_filters = [
+                    {"can_id": self.RECEIVE_ID, "can_mask": 0x7FF, "extended": False},
+                    {"can_id": self.HANDSHAKE_RECEIVE_ID, "can_mask": 0x7FF, "extended": False},
+                ]
             self.logger.info(f"正在连接到CAN总线 {self.interface}...")
             self.bus = can.interface.Bus(
                 channel=self.interface,
                 bustype='socketcan',
                 bitrate=self.bitrate,
-                receive_own_messages=False
+                receive_own_messages=False,
+                can_filters=can_filters
             )
             self.logger.info(f"成功连接到CAN总线 {self.interface}")
+            try:
+                sock = self.bus.socket
+                self._socket_fd = sock.fileno()
+            except AttributeError:
+                self._socket_fd = None
+            else:
+                try:
+                    # 加大内核收发缓冲区（实际值受net.core.rmem_max/wmem_max限制）：
+                    # 突发帧在Python被调度前先由内核排队，减少RAW socket溢出丢帧，
+                    # 发送侧总线仲裁繁忙时也不至于立刻ENOBUFS
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 18)
+                except OSError as e:
+                    self.logger.warning(f"设置CAN缓冲区大小失败: {e}")
             
+            # 先建立常驻接收链路，握手复用这条链路等响应。
+            # 优先把socketcan描述符直接注册到事件循环：内核可读时在
+            # 循环线程内回调排空，没有Notifier线程也没有
+            # call_soon_threadsafe跨线程跳转；拿不到描述符的总线
+            # （如virtual）回退can.Notifier线程投递
+            self.rx_reader = _BoundedAsyncReader()
+            loop = asyncio.get_running_loop()
+            if self._socket_fd is not None:
+                loop.add_reader(self._socket_fd, self._on_can_readable)
+                self._fd_reader_registered = True
+            else:
+                self.rx_notifier = can.Notifier(self.bus, [self.rx_reader], loop=loop)
+
             # 执行握手过程
             if not await self._perform_handshake():
                 self.logger.error("握手过程失败")
                 # 清理连接但保持auto_reconnect
                 await self._cleanup_connection()
                 return False
-            
+
             self.connected = True
+            self._last_status_key = None  # 重连后首帧状态必须重新上报
 
-            # 启动后台任务
+            # 启动后台任务：接收任务只做协议分发，不阻塞事件循环
+            # 防御：上一连接的消费任务若未经清理仍在运行，先取消，
+            # 避免覆盖引用后旧任务滞留在已废弃的队列上
+            if self._rfid_consumer_task:
+                self._rfid_consumer_task.cancel()
+            if self._status_consumer_task:
+                self._status_consumer_task.cancel()
+            self._rfid_queue = asyncio.Queue(maxsize=256)
+            self._rfid_consumer_task = asyncio.create_task(self._rfid_consumer_loop())
+            self._status_queue = asyncio.Queue(maxsize=64)
+            self._status_consumer_task = asyncio.create_task(self._status_consumer_loop())
             self.rx_task = asyncio.create_task(self._receive_loop())
             self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             
@@ -156,6 +419,7 @@ class FeederCabinetCAN:
             return True
         except Exception as e:
             self.logger.error(f"连接CAN总线失败: {str(e)}", exc_info=True)
+            self._stop_notifier()
             if self.bus:
                 try:
                     self.bus.shutdown()
@@ -175,18 +439,94 @@ class FeederCabinetCAN:
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
             tasks_to_cancel.append(self.heartbeat_task)
+        if self._rfid_consumer_task:
+            self._rfid_consumer_task.cancel()
+            tasks_to_cancel.append(self._rfid_consumer_task)
+            self._rfid_consumer_task = None
+        if self._status_consumer_task:
+            self._status_consumer_task.cancel()
+            tasks_to_cancel.append(self._status_consumer_task)
+            self._status_consumer_task = None
 
         if tasks_to_cancel:
             await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
 
+        self._stop_notifier()
+
         if self.bus:
             try:
                 self.bus.shutdown()
             except Exception as e:
                 self.logger.error(f"关闭CAN总线时发生错误: {str(e)}")
             self.bus = None
-            
+
         self.logger.info("已清理CAN总线连接")
+
+    def _on_can_readable(self):
+        """socketcan描述符可读回调
+
+        由loop.add_reader在内核缓冲区有帧时调用（在事件循环线程内），
+        非阻塞逐帧读出并投递到异步缓冲区，直到内核缓冲排空。
+        """
+        bus = self.bus
+        reader = self.rx_reader
+        if bus is None or reader is None:
+            return
+        listeners = self._listeners
+        try:
+            while True:
+                msg = bus.recv(timeout=0)
+                if msg is None:
+                    return
+                reader.on_message_received(msg)
+                for listener in listeners:
+                    try:
+                        listener.on_message_received(msg)
+                    except Exception as e:
+                        self.logger.error(f"监听器处理CAN帧时发生错误: {e}")
+        except (can.CanError, OSError) as e:
+            # recv出错按连接断开处理（与原接收循环的错误分支一致）。
+            # 必须先解除描述符注册：出错的socket保持可读，
+            # 留着注册会让事件循环在同一错误上空转
+            self.logger.error(f"读取CAN帧失败: {e}")
+
+            error_str = str(e).lower()
+            if "no such device" in error_str:
+                self.logger.error("CAN设备已消失！可能是硬件断开或驱动问题")
+            elif "network is down" in error_str:
+                self.logger.error("CAN网络已关闭！可能是接口被禁用")
+
+            if self._fd_reader_registered:
+                self._fd_reader_registered = False
+                if self._socket_fd is not None:
+                    try:
+                        asyncio.get_running_loop().remove_reader(self._socket_fd)
+                    except (RuntimeError, OSError):
+                        pass
+
+            self.connected = False
+            if not self.reconnect_lock.locked():
+                asyncio.create_task(self.reconnect())
+
+    def _stop_notifier(self):
+        """停止接收通知器并释放缓冲区"""
+        if self._fd_reader_registered:
+            self._fd_reader_registered = False
+            if self._socket_fd is not None:
+                try:
+                    asyncio.get_running_loop().remove_reader(self._socket_fd)
+                except (RuntimeError, OSError):
+                    pass
+        if self.rx_notifier:
+            try:
+                self.rx_notifier.stop()
+            except Exception as e:
+                self.logger.error(f"停止CAN通知器时发生错误: {str(e)}")
+            self.rx_notifier = None
+        # 两条接收路径的监听器都随连接一起失效，重连后需重新挂接
+        self._listeners.clear()
+        self.rx_reader = None
+        self._socket_fd = None
     
     async def disconnect(self):
         """断开CAN总线连接"""
@@ -200,17 +540,28 @@ class FeederCabinetCAN:
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
             tasks_to_cancel.append(self.heartbeat_task)
+        if self._rfid_consumer_task:
+            self._rfid_consumer_task.cancel()
+            tasks_to_cancel.append(self._rfid_consumer_task)
+            self._rfid_consumer_task = None
+        if self._status_consumer_task:
+            self._status_consumer_task.cancel()
+            tasks_to_cancel.append(self._status_consumer_task)
+            self._status_consumer_task = None
 
         if tasks_to_cancel:
             await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
 
+        self._stop_notifier()
+
         if self.bus:
             try:
                 self.bus.shutdown()
             except Exception as e:
                 self.logger.error(f"关闭CAN总线时发生错误: {str(e)}")
             self.bus = None
-            
+
+        self.dedup_logger.flush()
         self.logger.info("已断开CAN总线连接")
     
     async def reconnect(self):
@@ -224,20 +575,26 @@ class FeederCabinetCAN:
                 return
 
             self.logger.info("开始CAN总线重连过程...")
-            
-            # 停止现有任务
-            if self.rx_task: self.rx_task.cancel()
-            if self.heartbeat_task: self.heartbeat_task.cancel()
-            
-            # 循环尝试直到重连成功
+
+            # 彻底清理旧连接：停止接收/心跳/消费任务，解除描述符注册
+            # 或停止通知器，并关闭旧总线。只取消任务的话，旧socket的
+            # add_reader注册会一直留在事件循环里（旧fd持续可读导致
+            # 每个循环周期空转），每轮重连还会各漏一个fd和消费任务
+            await self._cleanup_connection()
+
+            # 循环尝试直到重连成功：失败间隔从0.5秒指数增长，
+            # 封顶在reconnect_interval，避免设备长期离线时固定频率空转
+            retry_delay = 0.5
             while self.auto_reconnect and not self.connected:
                 if await self.connect():
+                    # 断线风暴结束，补记被抑制的重复日志汇总
+                    self.dedup_logger.flush()
                     self.logger.info("CAN总线重连成功！")
                     
                     # 调用重连成功回调
-                    if self.reconnect_callback:
+                    if self.cb.reconnect:
                         try:
-                            await self.reconnect_callback()
+                            await self.cb.reconnect()
                         except Exception as e:
                             self.logger.error(f"执行重连回调时发生错误: {e}", exc_info=True)
                     
@@ -253,8 +610,9 @@ class FeederCabinetCAN:
                     
                     return
                 else:
-                    self.logger.warning(f"重连失败，将在 {self.reconnect_interval} 秒后重试。")
-                    await asyncio.sleep(self.reconnect_interval)
+                    self.logger.warning(f"重连失败，将在 {retry_delay:.1f} 秒后重试。")
+                    await asyncio.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, self.reconnect_interval)
 
     async def _perform_handshake(self) -> bool:
         """
@@ -264,43 +622,51 @@ class FeederCabinetCAN:
             bool: 握手是否成功
         """
         try:
-            # 发送握手消息
+            # 握手消息（重发时复用同一对象）
             handshake_msg = can.Message(
                 arbitration_id=self.HANDSHAKE_SEND_ID,
                 data=self.HANDSHAKE_DATA,
                 is_extended_id=False
             )
-            self.bus.send(handshake_msg)
-            self.logger.info(f"已发送握手消息: ID=0x{self.HANDSHAKE_SEND_ID:03X}, 数据={[hex(x) for x in self.HANDSHAKE_DATA]}")
-            
-            # 等待握手响应，超时5秒
-            reader = can.AsyncBufferedReader()
-            notifier = can.Notifier(self.bus, [reader])
-            
-            try:
-                # 使用asyncio.wait_for设置超时
-                msg = await asyncio.wait_for(reader.get_message(), timeout=5.0)
-
-                if msg and msg.arbitration_id == self.HANDSHAKE_RECEIVE_ID:
-                    self.logger.debug(f"收到握手响应: ID=0x{msg.arbitration_id:03X}, 数据={[hex(x) for x in msg.data]}")
-                    response_data = list(msg.data)
-                    if response_data == self.HANDSHAKE_RESPONSE:
-                        self.logger.info("收到正确的握手响应")
-                        notifier.stop()
-                        return True
-                    else:
-                        self.logger.error(f"收到错误的握手响应数据: {[hex(x) for x in response_data]}")
-                else:
-                    self.logger.error(f"收到非握手响应消息或无响应")
-                
-                notifier.stop()
-                return False
+            # 等待响应复用connect()已建立的常驻接收链路；
+            # 单次尝试超时后重发握手帧再等：总线繁忙时单帧可能被
+            # 挤掉，重发比等满一个长超时恢复得快。
+            # 中途收到的非握手帧跳过而不是直接判定失败
+            get_message = self.rx_reader.get_message
+
+            for attempt in range(3):
+                self.bus.send(handshake_msg)
+                self.logger.info(f"已发送握手消息: ID=0x{self.HANDSHAKE_SEND_ID:03X}, "
+                                 f"数据={self.HANDSHAKE_DATA.hex()} (尝试 {attempt + 1}/3)")
+
+                deadline = time.monotonic() + 2.0
+                try:
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError
+
+                        msg = await asyncio.wait_for(get_message(), timeout=remaining)
+
+                        if msg.arbitration_id != self.HANDSHAKE_RECEIVE_ID:
+                            self.logger.debug("握手期间忽略非握手帧: ID=0x%03X", msg.arbitration_id)
+                            continue
+
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug("收到握手响应: ID=0x%03X, 数据=%s", msg.arbitration_id, msg.data.hex())
+                        if bytes(msg.data) == self.HANDSHAKE_RESPONSE:
+                            self.logger.info("收到正确的握手响应")
+                            return True
+
+                        self.logger.error(f"收到错误的握手响应数据: {msg.data.hex()}")
+                        return False
+
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"握手尝试 {attempt + 1}/3 超时")
+
+            self.logger.error("握手超时 - 多次重发后仍未收到响应")
+            return False
 
-            except asyncio.TimeoutError:
-                self.logger.error("握手超时 - 5秒内未收到响应")
-                notifier.stop()
-                return False
-            
         except can.CanError as e:
             self.logger.error(f"握手过程中发生CAN错误: {e}")
             return False
@@ -308,144 +674,204 @@ class FeederCabinetCAN:
             self.logger.error(f"握手过程发生错误: {str(e)}")
             return False
     
+    def _handle_query_frame(self, msg: 'can.Message'):
+        """处理余料状态查询请求帧"""
+        if self.cb.query:
+            asyncio.create_task(self.cb.query())
+
+    def _handle_mapping_set_frame(self, msg: 'can.Message'):
+        """处理料管映射设置帧"""
+        if self.cb.mapping_set and len(msg.data) >= 4 and msg.data[3] == 0x00 \
+                and msg.data[1] < 2 and msg.data[2] < 2 and msg.data[1] != msg.data[2]:
+            mapping_data = {
+                'left_tube': msg.data[1],
+                'right_tube': msg.data[2],
+                'status': msg.data[3]
+            }
+            asyncio.create_task(self.cb.mapping_set(mapping_data))
+
+    def _handle_rfid_frame(self, msg: 'can.Message'):
+        """处理RFID相关消息帧"""
+        command = msg.data[0]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("收到RFID消息: 命令=0x%02X, 数据=%s", command, msg.data.hex())
+        if self.cb.rfid:
+            rfid_data = {
+                'command': command,
+                # bytes单块存储代替逐字节装箱的list；
+                # 消费方的bytes(data['data'])对bytes是零拷贝直通
+                'data': bytes(msg.data)
+            }
+            try:
+                self._rfid_queue.put_nowait(rfid_data)
+            except asyncio.QueueFull:
+                self.dedup_logger.warning("RFID队列已满，丢弃一帧: 命令=0x%02X", command)
+        else:
+            self.logger.warning("收到RFID消息但没有设置回调函数")
+
+    def _handle_filament_out_frame(self, msg: 'can.Message'):
+        """处理断料通知帧"""
+        if len(msg.data) < 6:
+            self.logger.warning(f"断料通知数据长度不足: {len(msg.data)} < 6")
+            return
+
+        is_valid = msg.data[1]
+        filament_id = msg.data[2]
+        extruder_id = msg.data[3]
+        status = msg.data[4]
+        material_type = msg.data[5]
+        material_name = _MATERIAL_TYPES.get(material_type, "未定义")
+
+        self.logger.info(f"收到断料通知: 有效={is_valid}, 耗材通道={filament_id}, 挤出机={extruder_id}, 状态={status}, 耗材类型={material_name}(0x{material_type:02X})")
+
+        if is_valid == 0x01 and status == 0x01 and filament_id < 6 and extruder_id < 2 and self.cb.filament_out:
+            filament_out_data = {
+                'is_valid': is_valid,
+                'filament_id': filament_id,
+                'extruder_id': extruder_id,
+                'status': status,
+                'material_type': material_type,
+                'material_name': material_name
+            }
+            asyncio.create_task(self.cb.filament_out(filament_out_data))
+        else:
+            self.logger.debug("断料通知无效或没有设置回调函数")
+
+    def _handle_low_weight_frame(self, msg: 'can.Message'):
+        """处理低重量通知帧"""
+        if len(msg.data) < 7:
+            self.logger.warning(f"低重量通知数据长度不足: {len(msg.data)} < 7")
+            return
+
+        is_valid = msg.data[1]
+        filament_id = msg.data[2]
+        buffer_id = msg.data[3]
+        net_weight = int.from_bytes(msg.data[4:6], 'big')  # 高字节在前
+        material_type = msg.data[6]
+        material_name = _MATERIAL_TYPES.get(material_type, "未定义")
+
+        self.logger.info(f"收到低重量通知: 有效={is_valid}, 耗材通道={filament_id}, "
+                       f"缓冲区={'左' if buffer_id == 0 else '右'}({buffer_id}), 净重量={net_weight}g, "
+                       f"耗材类型={material_name}(0x{material_type:02X})")
+
+        if is_valid == 0x01 and filament_id < 6 and buffer_id < 2 and self.cb.low_weight:
+            low_weight_data = {
+                'is_valid': is_valid,
+                'filament_id': filament_id,
+                'buffer_id': buffer_id,
+                'net_weight': net_weight,
+                'material_type': material_type,
+                'material_name': material_name
+            }
+            asyncio.create_task(self.cb.low_weight(low_weight_data))
+        else:
+            self.logger.debug("低重量通知无效或没有设置回调函数")
+
+    def _handle_default_frame(self, msg: 'can.Message'):
+        """处理分发表之外的帧：心跳响应、状态帧和未知命令"""
+        command = msg.data[0]
+        # 检查是否为心跳响应 (根据你的candump，响应格式为: 05 00 FA E2 7E)
+        if command == 0x05:
+            self.logger.debug("收到心跳响应")
+            self._heartbeat_event.set()
+        # 只有特定的状态命令才调用状态回调
+        elif command in self._STATUS_COMMANDS:
+            if self.cb.status:
+                # 稳态下状态帧逐帧重复，内容未变时直接跳过
+                status_key = bytes(msg.data[:3])
+                if status_key == self._last_status_key:
+                    return
+                self._last_status_key = status_key
+                status_data = {
+                    'status': msg.data[0],
+                    'progress': msg.data[1] if len(msg.data) > 1 else 0,
+                    'error_code': msg.data[2] if len(msg.data) > 2 else 0,
+                    'raw_data': bytes(msg.data)
+                }
+                try:
+                    self._status_queue.put_nowait(status_data)
+                except asyncio.QueueFull:
+                    # 丢最旧留最新：过期状态上报没有意义
+                    try:
+                        self._status_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        pass
+                    self._status_queue.put_nowait(status_data)
+                    self.dedup_logger.warning("状态队列已满，丢弃最旧一帧")
+        else:
+            # 未知命令，记录但不处理
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("收到未知命令: 0x%02X, 数据=%s", command, msg.data.hex())
+
+    # 命令分发表：单次字典查找直达处理函数，代替逐条elif比较；
+    # 类属性存函数对象，调用时显式传入self，新增命令只需登记一行
+    _RX_DISPATCH = {
+        CMD_QUERY_PRINTER_FILAMENT_STATUS: _handle_query_frame,
+        CMD_SET_FEEDER_MAPPING: _handle_mapping_set_frame,
+        CMD_RFID_RAW_DATA_NOTIFY: _handle_rfid_frame,
+        CMD_RFID_RAW_DATA_RESPONSE: _handle_rfid_frame,
+        CMD_RFID_DATA_PACKET: _handle_rfid_frame,
+        CMD_RFID_DATA_END: _handle_rfid_frame,
+        CMD_RFID_READ_ERROR: _handle_rfid_frame,
+        CMD_FILAMENT_OUT_NOTIFY: _handle_filament_out_frame,
+        CMD_LOW_WEIGHT_NOTIFY: _handle_low_weight_frame,
+    }
+
+    def _dispatch_frame(self, msg: 'can.Message'):
+        """解析单帧并调度对应的回调任务"""
+        if msg.arbitration_id != self.RECEIVE_ID:
+            return
+
+        # 每帧都会经过这里：DEBUG未开启时跳过hex格式化
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("收到消息: ID=0x%03X, 数据=%s", msg.arbitration_id, msg.data.hex())
+
+        if not msg.data:
+            self.logger.warning("收到空数据帧")
+            return
+
+        handler = self._RX_DISPATCH.get(msg.data[0])
+        if handler is not None:
+            handler(self, msg)
+        else:
+            self._handle_default_frame(msg)
+
     async def _receive_loop(self):
         """接收消息循环，在独立异步任务中运行"""
         self.logger.info("异步接收任务已启动")
-        
+
+        # 热路径属性绑定为局部名：循环内LOAD_FAST代替逐帧的属性查找
+        # （rx_reader在本任务生命周期内不会更换，重连会重建任务）
+        get_message = self.rx_reader.get_message
+        buffer = self.rx_reader.buffer
+        buffer_get_nowait = buffer.get_nowait
+        dispatch_frame = self._dispatch_frame
+        receive_id = self.RECEIVE_ID
+        status_commands = self._STATUS_COMMANDS
+
         while self.auto_reconnect and self.connected:
             try:
-                # 使用非阻塞接收，超时时间短以保持响应性
-                msg = self.bus.recv(timeout=0.1)
-                
-                if msg is None:
-                    # 没有消息时短暂异步睡眠，让出控制权
-                    await asyncio.sleep(0.01)
-                    continue
-                    
-                if msg.arbitration_id == self.RECEIVE_ID:
-                        self.logger.debug(f"收到消息: ID=0x{msg.arbitration_id:03X}, 数据={[hex(x) for x in msg.data]}")
-                        
-                        if not msg.data:
-                            self.logger.warning("收到空数据帧")
-                            continue
+                # 等待通知器投递的帧：内核socket可读时才被唤醒，
+                # 不再以固定超时轮询阻塞事件循环
+                msg = await get_message()
 
-                        command = msg.data[0]
-
-                        if command == self.CMD_QUERY_PRINTER_FILAMENT_STATUS and self.query_callback:
-                            asyncio.create_task(self.query_callback())
-                        elif command == self.CMD_SET_FEEDER_MAPPING and self.mapping_set_callback:
-                             if len(msg.data) >= 4 and msg.data[3] == 0x00 and msg.data[1] < 2 and msg.data[2] < 2 and msg.data[1] != msg.data[2]:
-                                mapping_data = {
-                                    'left_tube': msg.data[1],
-                                    'right_tube': msg.data[2],
-                                    'status': msg.data[3]
-                                }
-                                asyncio.create_task(self.mapping_set_callback(mapping_data))
-                        elif command in [self.CMD_RFID_RAW_DATA_NOTIFY, self.CMD_RFID_RAW_DATA_RESPONSE, 
-                                       self.CMD_RFID_DATA_PACKET, self.CMD_RFID_DATA_END, self.CMD_RFID_READ_ERROR]:
-                            # RFID相关消息
-                            self.logger.debug(f"收到RFID消息: 命令=0x{command:02X}, 数据={[hex(x) for x in msg.data]}")
-                            if self.rfid_callback:
-                                rfid_data = {
-                                    'command': command,
-                                    'data': list(msg.data)
-                                }
-                                asyncio.create_task(self.rfid_callback(rfid_data))
-                            else:
-                                self.logger.warning("收到RFID消息但没有设置回调函数")
-                        elif command == self.CMD_FILAMENT_OUT_NOTIFY:
-                            # 断料通知消息
-                            if len(msg.data) >= 6:
-                                is_valid = msg.data[1]
-                                filament_id = msg.data[2]
-                                extruder_id = msg.data[3]
-                                status = msg.data[4]
-                                material_type = msg.data[5] if len(msg.data) >= 6 else 0x00
-                                
-                                # 解析耗材类型
-                                material_types = {
-                                    0x00: "未知",      # Unknown
-                                    0x01: "PLA",       # PLA
-                                    0x02: "PETG",      # PETG  
-                                    0x03: "ABS",       # ABS
-                                    0x04: "ASA",       # ASA
-                                    0xFF: "其他"       # Other
-                                }
-                                material_name = material_types.get(material_type, "未定义")
-                                
-                                self.logger.info(f"收到断料通知: 有效={is_valid}, 耗材通道={filament_id}, 挤出机={extruder_id}, 状态={status}, 耗材类型={material_name}(0x{material_type:02X})")
-                                
-                                if is_valid == 0x01 and status == 0x01 and filament_id < 6 and extruder_id < 2 and self.filament_out_callback:
-                                    filament_out_data = {
-                                        'is_valid': is_valid,
-                                        'filament_id': filament_id,
-                                        'extruder_id': extruder_id,
-                                        'status': status,
-                                        'material_type': material_type,
-                                        'material_name': material_name
-                                    }
-                                    asyncio.create_task(self.filament_out_callback(filament_out_data))
-                                else:
-                                    self.logger.debug("断料通知无效或没有设置回调函数")
-                            else:
-                                self.logger.warning(f"断料通知数据长度不足: {len(msg.data)} < 6")
-                        elif command == self.CMD_LOW_WEIGHT_NOTIFY:
-                            # 低重量通知消息
-                            if len(msg.data) >= 7:
-                                is_valid = msg.data[1]
-                                filament_id = msg.data[2]
-                                buffer_id = msg.data[3]
-                                net_weight = (msg.data[4] << 8) | msg.data[5]  # 高字节在前
-                                material_type = msg.data[6]
-
-                                # 解析耗材类型
-                                material_types = {
-                                    0x00: "未知",      # Unknown
-                                    0x01: "PLA",       # PLA
-                                    0x02: "PETG",      # PETG
-                                    0x03: "ABS",       # ABS
-                                    0x04: "ASA",       # ASA
-                                    0xFF: "其他"       # Other
-                                }
-                                material_name = material_types.get(material_type, "未定义")
-
-                                self.logger.info(f"收到低重量通知: 有效={is_valid}, 耗材通道={filament_id}, "
-                                               f"缓冲区={'左' if buffer_id == 0 else '右'}({buffer_id}), 净重量={net_weight}g, "
-                                               f"耗材类型={material_name}(0x{material_type:02X})")
-
-                                if is_valid == 0x01 and filament_id < 6 and buffer_id < 2 and self.low_weight_callback:
-                                    low_weight_data = {
-                                        'is_valid': is_valid,
-                                        'filament_id': filament_id,
-                                        'buffer_id': buffer_id,
-                                        'net_weight': net_weight,
-                                        'material_type': material_type,
-                                        'material_name': material_name
-                                    }
-                                    asyncio.create_task(self.low_weight_callback(low_weight_data))
-                                else:
-                                    self.logger.debug("低重量通知无效或没有设置回调函数")
-                            else:
-                                self.logger.warning(f"低重量通知数据长度不足: {len(msg.data)} < 7")
-                        else:
-                            # 检查是否为心跳响应 (根据你的candump，响应格式为: 05 00 FA E2 7E)
-                            if len(msg.data) >= 1 and msg.data[0] == 0x05:
-                                self.logger.debug("收到心跳响应")
-                                self.heartbeat_response_received = True
-                            # 只有特定的状态命令才调用状态回调
-                            elif command in [self.STATUS_IDLE, self.STATUS_READY, self.STATUS_FEEDING, 
-                                           self.STATUS_COMPLETE, self.STATUS_ERROR]:
-                                if self.status_callback:
-                                    status_data = {
-                                        'status': msg.data[0],
-                                        'progress': msg.data[1] if len(msg.data) > 1 else 0,
-                                        'error_code': msg.data[2] if len(msg.data) > 2 else 0,
-                                        'raw_data': list(msg.data)
-                                    }
-                                    asyncio.create_task(self.status_callback(status_data))
-                            else:
-                                # 未知命令，记录但不处理
-                                self.logger.debug(f"收到未知命令: 0x{command:02X}, 数据={[hex(x) for x in msg.data]}")
+                # 批量排空：突发到达的帧在一次唤醒内全部处理完，
+                # 后续帧直接从缓冲区非阻塞取出，免去逐帧的await调度开销。
+                # 状态帧在批内按"最新为准"合并：中间状态已过期，
+                # 只有批内最后一帧状态值得上报
+                pending_status = None
+                while True:
+                    if (msg.arbitration_id == receive_id and msg.data
+                            and msg.data[0] in status_commands):
+                        pending_status = msg
+                    else:
+                        dispatch_frame(msg)
+                    try:
+                        msg = buffer_get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                if pending_status is not None:
+                    dispatch_frame(pending_status)
             except can.CanError as e:
                 self.logger.error(f"接收消息时发生CAN错误: {e}")
                 self.connected = False
@@ -471,45 +897,92 @@ class FeederCabinetCAN:
         
         self.logger.info("接收任务已结束")
     
+    async def _rfid_consumer_loop(self):
+        """RFID回调消费任务
+
+        从有界队列按到达顺序取出RFID帧并串行执行回调，
+        代替逐帧asyncio.create_task，同时保证数据包的处理顺序。
+        """
+        while True:
+            rfid_data = await self._rfid_queue.get()
+            callback = self.cb.rfid
+            if callback is None:
+                continue
+            try:
+                await callback(rfid_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"处理RFID回调时发生错误: {e}", exc_info=True)
+
+    async def _status_consumer_loop(self):
+        """状态回调消费任务
+
+        从有界队列按到达顺序取出状态数据并串行执行回调，
+        状态机看到的状态变化顺序与总线到达顺序一致。
+        """
+        while True:
+            status_data = await self._status_queue.get()
+            callback = self.cb.status
+            if callback is None:
+                continue
+            try:
+                await callback(status_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"处理状态回调时发生错误: {e}", exc_info=True)
+
     async def _heartbeat_loop(self):
         """心跳消息循环，在独立异步任务中运行"""
         self.logger.info("异步心跳任务已启动")
         heartbeat_fail_count = 0
         max_heartbeat_failures = 2  # 连续失败2次后认为断开
-        
+        # 事件循环自带的单调时钟：与loop内部定时器同源，读取代价低
+        loop_time = asyncio.get_running_loop().time
+        # 心跳按绝对截止时间调度：下一次发送时刻在上一时刻基础上累加
+        # 间隔，发送耗时、等待响应耗时和sleep唤醒误差不会逐周期累积
+        next_send = loop_time()
+
         while True:
             try:
                 if self.connected:
-                    # 重置响应标志
-                    self.heartbeat_response_received = False
-                    import time
-                    self.heartbeat_sent_time = time.time()
-                    
+                    now = loop_time()
+                    if now < next_send:
+                        await asyncio.sleep(next_send - now)
+
+                    self._heartbeat_event.clear()
+                    sent_time = loop_time()
+                    # 推进截止时间；落后超过一个周期时按当前时间重新对齐
+                    next_send += self.heartbeat_interval
+                    if next_send < sent_time:
+                        next_send = sent_time + self.heartbeat_interval
+
                     # 发送心跳
                     success = await self.send_message(self.CMD_HEARTBEAT)
                     if not success:
                         heartbeat_fail_count += 1
                         self.logger.warning(f"心跳发送失败 ({heartbeat_fail_count}/{max_heartbeat_failures})")
-                        # 发送失败，立即重试
-                        await asyncio.sleep(0.1)  # 短暂延迟后重试
+                        # 发送失败，短暂延迟后立即重试
+                        await asyncio.sleep(0.1)
+                        next_send = loop_time()
                     else:
-                        # 发送成功，等待响应
-                        await asyncio.sleep(self.heartbeat_timeout)
-                        
-                        if not self.heartbeat_response_received:
+                        # 发送成功，等待响应事件：响应到达时立即被唤醒，
+                        # 只有真正丢包才会等满heartbeat_timeout
+                        try:
+                            await asyncio.wait_for(self._heartbeat_event.wait(),
+                                                   timeout=self.heartbeat_timeout)
+                        except asyncio.TimeoutError:
                             heartbeat_fail_count += 1
                             self.logger.warning(f"心跳未收到响应 ({heartbeat_fail_count}/{max_heartbeat_failures})")
                             # 未收到响应，立即发送下一个心跳
+                            next_send = loop_time()
                         else:
-                            # 收到响应，重置计数器，等待正常间隔
+                            # 收到响应，重置计数器，下一拍按截止时间等待
                             if heartbeat_fail_count > 0:
                                 self.logger.info("心跳响应恢复正常")
                             heartbeat_fail_count = 0
-                            # 正常情况下等待剩余时间（总共3秒间隔）
-                            remaining_time = self.heartbeat_interval - self.heartbeat_timeout
-                            if remaining_time > 0:
-                                await asyncio.sleep(remaining_time)
-                    
+
                     # 检查是否需要判定断开
                     if heartbeat_fail_count >= max_heartbeat_failures:
                         self.logger.error("连续心跳失败或无响应，判定CAN连接已断开")
@@ -518,8 +991,9 @@ class FeederCabinetCAN:
                         if not self.reconnect_lock.locked():
                             asyncio.create_task(self.reconnect())
                 else:
-                    # 未连接时等待
+                    # 未连接时等待，恢复连接后从当前时间重新起拍
                     await asyncio.sleep(1)
+                    next_send = loop_time()
                             
             except asyncio.CancelledError:
                 self.logger.info("心跳任务被取消")
@@ -542,7 +1016,7 @@ class FeederCabinetCAN:
         Args:
             callback: 状态回调函数，接收一个状态数据字典
         """
-        self.status_callback = callback
+        self.cb.status = callback
     
     def set_query_callback(self, callback: Callable[[], Coroutine]):
         """
@@ -551,7 +1025,7 @@ class FeederCabinetCAN:
         Args:
             callback: 查询回调函数，无参数
         """
-        self.query_callback = callback
+        self.cb.query = callback
     
     def set_mapping_query_callback(self, callback: Callable[[], Coroutine]):
         """
@@ -560,7 +1034,7 @@ class FeederCabinetCAN:
         Args:
             callback: 料管映射查询回调函数，无参数
         """
-        self.mapping_query_callback = callback
+        self.cb.mapping_query = callback
     
     def set_mapping_response_callback(self, callback: Callable[[Dict], Coroutine]):
         """
@@ -569,7 +1043,7 @@ class FeederCabinetCAN:
         Args:
             callback: 料管映射响应回调函数，接收一个映射数据字典
         """
-        self.mapping_response_callback = callback
+        self.cb.mapping_response = callback
     
     def set_mapping_set_callback(self, callback: Callable[[Dict], Coroutine]):
         """
@@ -578,7 +1052,7 @@ class FeederCabinetCAN:
         Args:
             callback: 料管映射设置回调函数，接收一个映射数据字典
         """
-        self.mapping_set_callback = callback
+        self.cb.mapping_set = callback
     
     def set_reconnect_callback(self, callback: Callable[[], Coroutine]):
         """
@@ -587,7 +1061,7 @@ class FeederCabinetCAN:
         Args:
             callback: 重连成功回调函数
         """
-        self.reconnect_callback = callback
+        self.cb.reconnect = callback
     
     def set_rfid_callback(self, callback: Callable[[Dict], Coroutine]):
         """
@@ -596,7 +1070,7 @@ class FeederCabinetCAN:
         Args:
             callback: RFID数据回调函数，接收包含命令和数据的字典
         """
-        self.rfid_callback = callback
+        self.cb.rfid = callback
     
     def set_filament_out_callback(self, callback: Callable[[Dict], Coroutine]):
         """
@@ -605,7 +1079,7 @@ class FeederCabinetCAN:
         Args:
             callback: 断料通知回调函数，接收包含断料信息的字典
         """
-        self.filament_out_callback = callback
+        self.cb.filament_out = callback
 
     def set_low_weight_callback(self, callback: Callable[[Dict], Coroutine]):
         """
@@ -614,31 +1088,44 @@ class FeederCabinetCAN:
         Args:
             callback: 低重量通知回调函数，接收包含低重量信息的字典
         """
-        self.low_weight_callback = callback
+        self.cb.low_weight = callback
     
-    async def _send_with_retry(self, msg: 'can.Message', retries: int = 3, retry_delay: float = 0.05) -> bool:
+    async def _send_frame(self, data: Union[bytes, bytearray], retries: int = 3, retry_delay: float = 0.05) -> bool:
         """
-        带重试机制的发送方法
+        通过共享帧模板发送一帧数据
+
+        所有固定8字节命令帧共用这一条路径，避免每帧新建can.Message。
+        每次尝试只在send_lock内完成模板写入与发送；重试退避在锁外
+        进行，一次故障发送的退避不会把其他发送方堵在锁后面，
+        重试时会重新填充模板。
 
         Args:
-            msg: can.Message 对象
+            data: 帧数据，最多8字节，不足部分自动补零
             retries: 重试次数
             retry_delay: 重试间隔 (秒)
 
         Returns:
             bool: 发送是否成功
         """
-        if not self.connected or not self.bus:
-            self.logger.error("CAN总线未连接，无法发送消息")
-            if not self.reconnect_lock.locked():
-                asyncio.create_task(self.reconnect())
-            return False
+        last_exception = None
+        for attempt in range(retries):
+            async with self.send_lock:
+                buf = self._tx_buf
+                n = len(data)
+                buf[:n] = data
+                if n < 8:
+                    buf[n:] = _FRAME_PADDING[n]
+
+                # 快路径：编译了_canfast时直接write(2)到socketcan描述符
+                if _canfast is not None and self._socket_fd is not None:
+                    try:
+                        _canfast.send_frame(self._socket_fd, self.SEND_ID, buf)
+                        return True
+                    except OSError as e:
+                        self.logger.warning(f"快路径发送失败，回退python-can: {e}")
 
-        async with self.send_lock:
-            last_exception = None
-            for attempt in range(retries):
                 try:
-                    self.bus.send(msg)
+                    self.bus.send(self._tx_msg)
                     return True
                 except can.CanError as e:
                     last_exception = e
@@ -648,17 +1135,18 @@ class FeederCabinetCAN:
                         self.connected = False
                         asyncio.create_task(self.reconnect())
                         return False
-                    
-                    self.logger.warning(f"发送消息时发生CAN错误 (尝试 {attempt + 1}/{retries}): {e}")
-                    if attempt < retries - 1:
-                        await asyncio.sleep(retry_delay)
+
+                    self.dedup_logger.warning("发送消息时发生CAN错误 (尝试 %d/%d): %s", attempt + 1, retries, e)
                 except Exception as e:
                     self.logger.error(f"发送消息时发生未知错误: {e}")
                     self.connected = False
                     asyncio.create_task(self.reconnect())
                     return False
-        
-        self.logger.error(f"发送消息失败，已达到最大重试次数。最后一次错误: {last_exception}")
+
+            if attempt < retries - 1:
+                await asyncio.sleep(retry_delay)
+
+        self.dedup_logger.error("发送消息失败，已达到最大重试次数。最后一次错误: %s", last_exception)
         self.connected = False
         if not self.reconnect_lock.locked():
             asyncio.create_task(self.reconnect())
@@ -676,20 +1164,22 @@ class FeederCabinetCAN:
             bool: 发送是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
-            data = [cmd_type, extruder, 0, 0, 0, 0, 0, 0]
-            
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-            
-            return await self._send_with_retry(msg)
-            
+            # 去抖：同一命令在窗口内重复到达时直接视为已发送
+            now = time.monotonic()
+            last_cmd, last_extruder, last_time = self._last_cmd
+            if cmd_type == last_cmd and extruder == last_extruder and \
+                    now - last_time < self._cmd_debounce_window:
+                return True
+
+            if await self._send_frame(bytes((cmd_type, extruder))):
+                self._last_cmd = (cmd_type, extruder, now)
+                return True
+            return False
+
         except Exception as e:
             self.logger.error(f"构建或发送消息时发生未知错误: {str(e)}")
             return False
@@ -705,21 +1195,15 @@ class FeederCabinetCAN:
             bool: 请求是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
             # 格式: [CMD_ID, IS_VALID, TUBE_ID, ...]
-            data = [self.CMD_REQUEST_FEED, 0x00, tube_id, 0x00, 0x00, 0x00, 0x00, 0x00]
+            data = bytes([self.CMD_REQUEST_FEED, 0x00, tube_id, 0x00, 0x00, 0x00, 0x00, 0x00])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
-                self.logger.info(f"已发送补料请求: 料管ID={tube_id}, 数据={[hex(x) for x in data]}")
+            if await self._send_frame(data):
+                self.logger.info(f"已发送补料请求: 料管ID={tube_id}, 数据={data.hex()}")
                 return True
             else:
                 return False
@@ -739,21 +1223,15 @@ class FeederCabinetCAN:
             bool: 停止请求是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
             # 格式: [CMD_ID, IS_VALID, TUBE_ID, ...]
-            data = [self.CMD_STOP_FEED, 0x00, tube_id, 0x00, 0x00, 0x00, 0x00, 0x00]
+            data = bytes([self.CMD_STOP_FEED, 0x00, tube_id, 0x00, 0x00, 0x00, 0x00, 0x00])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
-                self.logger.info(f"已发送停止送料请求: 料管ID={tube_id}, 数据={[hex(x) for x in data]}")
+            if await self._send_frame(data):
+                self.logger.info(f"已发送停止送料请求: 料管ID={tube_id}, 数据={data.hex()}")
                 return True
             else:
                 return False
@@ -800,21 +1278,15 @@ class FeederCabinetCAN:
             bool: 发送是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
             validity_byte = 0x00 if is_valid else 0x01
-            data = [self.CMD_PRINTER_FILAMENT_STATUS_RESPONSE, validity_byte, status_bitmap, 0, 0, 0, 0, 0]
+            data = bytes([self.CMD_PRINTER_FILAMENT_STATUS_RESPONSE, validity_byte, status_bitmap, 0, 0, 0, 0, 0])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
-                self.logger.info(f"已发送挤出机余料状态响应: ID=0x{self.SEND_ID:03X}, 数据={[hex(x) for x in data]}")
+            if await self._send_frame(data):
+                self.logger.info(f"已发送挤出机余料状态响应: ID=0x{self.SEND_ID:03X}, 数据={data.hex()}")
                 return True
             else:
                 return False
@@ -835,19 +1307,13 @@ class FeederCabinetCAN:
             bool: 设置是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
-            data = [self.CMD_SET_FEEDER_MAPPING, left_tube_extruder, right_tube_extruder, 0x00, 0x00, 0x00, 0x00, 0x00]
+            data = bytes([self.CMD_SET_FEEDER_MAPPING, left_tube_extruder, right_tube_extruder, 0x00, 0x00, 0x00, 0x00, 0x00])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
+            if await self._send_frame(data):
                 self.logger.info(f"已发送料管映射设置: 左料管->挤出机{left_tube_extruder}, 右料管->挤出机{right_tube_extruder}")
                 return True
             else:
@@ -879,19 +1345,13 @@ class FeederCabinetCAN:
             bool: 发送是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
-            data = [self.CMD_FEEDER_MAPPING_RESPONSE, left_extruder, right_extruder, status, 0x00, 0x00, 0x00, 0x00]
+            data = bytes([self.CMD_FEEDER_MAPPING_RESPONSE, left_extruder, right_extruder, status, 0x00, 0x00, 0x00, 0x00])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
+            if await self._send_frame(data):
                 self.logger.info(f"已发送料管映射响应: 左料管->挤出机{left_extruder}, 右料管->挤出机{right_extruder}, 状态={status}")
                 return True
             else:
@@ -912,19 +1372,13 @@ class FeederCabinetCAN:
             bool: 请求是否成功发送
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
             
         try:
-            data = [self.CMD_RFID_RAW_DATA_REQUEST, 0x00, extruder_id, 0x00, 0x00, 0x00, 0x00, 0x00]
+            data = bytes([self.CMD_RFID_RAW_DATA_REQUEST, 0x00, extruder_id, 0x00, 0x00, 0x00, 0x00, 0x00])
             
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
-
-            if await self._send_with_retry(msg):
+            if await self._send_frame(data):
                 self.logger.info(f"已发送RFID数据请求: 挤出机{extruder_id}")
                 return True
             else:
@@ -949,7 +1403,7 @@ class FeederCabinetCAN:
             bool: 发送是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
 
         # 参数验证
@@ -971,18 +1425,12 @@ class FeederCabinetCAN:
             # 速度映射表（用于日志显示）
             speed_map = {0: 10, 1: 20, 2: 30, 3: 40, 4: 50, 5: 60, 6: 70, 7: 80}
 
-            data = [self.CMD_RETRACT_FILAMENT, 0x01, buffer_id, distance, speed, 0x00, 0x00, 0x00]
-
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
+            data = bytes([self.CMD_RETRACT_FILAMENT, 0x01, buffer_id, distance, speed, 0x00, 0x00, 0x00])
 
-            if await self._send_with_retry(msg):
+            if await self._send_frame(data):
                 self.logger.info(f"已发送耗材回退命令: 缓冲区={'左' if buffer_id == 0 else '右'}, "
                                f"距离={distance_map[distance]}mm, 速度={speed_map[speed]}mm/s, "
-                               f"数据={[hex(x) for x in data]}")
+                               f"数据={data.hex()}")
                 return True
             else:
                 return False
@@ -1006,7 +1454,7 @@ class FeederCabinetCAN:
             bool: 发送是否成功
         """
         if not self.connected or not self.bus:
-            self.logger.error("未连接到CAN总线，无法发送消息")
+            self.dedup_logger.error("未连接到CAN总线，无法发送消息")
             return False
 
         # 参数验证
@@ -1028,18 +1476,12 @@ class FeederCabinetCAN:
             # 速度映射表（用于日志显示）
             speed_map = {0: 10, 1: 20, 2: 30, 3: 40, 4: 50, 5: 60, 6: 70, 7: 80}
 
-            data = [self.CMD_EXTRUDE_FILAMENT, 0x01, buffer_id, distance, speed, 0x00, 0x00, 0x00]
-
-            msg = can.Message(
-                arbitration_id=self.SEND_ID,
-                data=data,
-                is_extended_id=False
-            )
+            data = bytes([self.CMD_EXTRUDE_FILAMENT, 0x01, buffer_id, distance, speed, 0x00, 0x00, 0x00])
 
-            if await self._send_with_retry(msg):
+            if await self._send_frame(data):
                 self.logger.info(f"已发送耗材挤出命令: 缓冲区={'左' if buffer_id == 0 else '右'}, "
                                f"距离={distance_map[distance]}mm, 速度={speed_map[speed]}mm/s, "
-                               f"数据={[hex(x) for x in data]}")
+                               f"数据={data.hex()}")
                 return True
             else:
                 return False
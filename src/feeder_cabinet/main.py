@@ -119,7 +119,13 @@ class FeederCabinetApp:
         config = {
             'can': {
                 'interface': DEFAULT_CAN_INTERFACE,
-                'bitrate': DEFAULT_CAN_BITRATE
+                'bitrate': DEFAULT_CAN_BITRATE,
+                # 可选：把进程绑定到处理CAN中断的CPU（如[0]），
+                # 避免跨核唤醒；None表示不绑定
+                'cpu_affinity': None,
+                # 可选：SCHED_FIFO实时优先级（1-99，如50），需要root且
+                # 通常配合PREEMPT_RT内核；None表示保持普通调度
+                'rt_priority': None
             },
             'klipper': {
                 'moonraker_url': DEFAULT_MOONRAKER_URL,
@@ -221,6 +227,39 @@ class FeederCabinetApp:
             self.logger.error(f"保存配置文件时发生错误: {str(e)}")
             return False
     
+    def _apply_cpu_affinity(self):
+        """按配置把进程绑定到指定CPU
+
+        在SMP的ARM SoC上CAN中断通常固定在某个核上（一般是CPU0），
+        把进程绑到同一个核可以减少接收唤醒时的跨核调度开销。
+        配置项can.cpu_affinity为CPU编号列表，未配置时不做绑定。
+        """
+        cpus = self.config.get('can', {}).get('cpu_affinity')
+        if not cpus:
+            return
+        try:
+            os.sched_setaffinity(0, set(cpus))
+            self.logger.info(f"已将进程绑定到CPU: {sorted(set(cpus))}")
+        except (OSError, AttributeError, ValueError) as e:
+            self.logger.warning(f"设置CPU亲和性失败: {e}")
+
+    def _apply_rt_priority(self):
+        """按配置把进程提升到SCHED_FIFO实时调度
+
+        普通SCHED_OTHER下心跳和接收分发可能被其他负载延迟数百微秒，
+        PREEMPT_RT内核上用实时优先级可以消除这类调度尖峰。
+        配置项can.rt_priority为1-99的优先级，未配置时不做调整；
+        需要root权限，失败时记录告警并继续以普通优先级运行。
+        """
+        priority = self.config.get('can', {}).get('rt_priority')
+        if not priority:
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(int(priority)))
+            self.logger.info(f"已将进程设置为SCHED_FIFO实时调度，优先级: {priority}")
+        except (OSError, AttributeError, ValueError) as e:
+            self.logger.warning(f"设置实时调度优先级失败: {e}")
+
     async def _handle_filament_status_query(self):
         """处理送料柜的挤出机余料状态查询请求。"""
         self.logger.info("收到挤出机余料状态查询请求")
@@ -1596,6 +1635,10 @@ class FeederCabinetApp:
             return True
             
         try:
+            # 可选的CPU绑定和实时优先级，需在后台任务启动前生效
+            self._apply_cpu_affinity()
+            self._apply_rt_priority()
+
             # 连接CAN总线
             if not await self.can_comm.connect():
                 self.logger.error("初次连接CAN总线失败，将启动自动重连任务")
@@ -33,6 +33,10 @@ RFID_ERR_TIMEOUT = 0x04         # 操作超时
 RFID_ERR_NO_MAPPING = 0x05     # 无挤出机映射
 RFID_ERR_BUSY = 0x06            # 系统忙，无法处理
 
+# 帧结构定义（大端），一次调用解出起始包/结束包的全部字段
+_START_STRUCT = struct.Struct('>BBBBHBB')  # 命令/序列号/通道或挤出机/总包数/数据长度/挤出机或通道/数据源
+_END_STRUCT = struct.Struct('>BBBHB')      # 命令/序列号/总包数/校验和/状态
+
 
 @dataclass
 class OpenTagFilamentData:
@@ -72,9 +76,16 @@ class RFIDTransferSession:
     total_packets: int
     data_length: int
     data_source: int  # 0=RFID读取, 1=手动输入
-    received_packets: Dict[int, bytes] = field(default_factory=dict)
+    # 按包序号预分配的定长列表：数据包直接落位，重组时一次join拼接，
+    # 不再为每包做整型键哈希和字典条目分配
+    packets: List[Optional[bytes]] = field(default_factory=list)
+    received_count: int = 0
     start_time: float = 0
     complete: bool = False
+
+    def __post_init__(self):
+        if not self.packets:
+            self.packets = [None] * self.total_packets
     
 
 class RFIDDataParser:
@@ -115,13 +126,9 @@ class RFIDDataParser:
             
     def _handle_notify_start(self, data: bytes) -> Dict:
         """处理主动通知起始包"""
-        sequence = data[1]
-        filament_id = data[2]
-        total_packets = data[3]
-        data_length = (data[4] << 8) | data[5]
-        extruder_id = data[6]
-        data_source = data[7]
-        
+        (_, sequence, filament_id, total_packets,
+         data_length, extruder_id, data_source) = _START_STRUCT.unpack_from(data)
+
         # 创建新的传输会话
         session = RFIDTransferSession(
             sequence=sequence,
@@ -147,13 +154,9 @@ class RFIDDataParser:
     def _handle_response_start(self, data: bytes) -> Dict:
         """处理查询响应起始包"""
         # 与通知包类似，但字段顺序略有不同
-        sequence = data[1]
-        extruder_id = data[2]
-        total_packets = data[3]
-        data_length = (data[4] << 8) | data[5]
-        filament_id = data[6]
-        data_source = data[7]
-        
+        (_, sequence, extruder_id, total_packets,
+         data_length, filament_id, data_source) = _START_STRUCT.unpack_from(data)
+
         session = RFIDTransferSession(
             sequence=sequence,
             extruder_id=extruder_id,
@@ -182,10 +185,15 @@ class RFIDDataParser:
         if not session:
             logger.warning(f"收到未知序列号的数据包: {sequence}")
             return None
-            
-        # 存储数据包
-        session.received_packets[packet_num] = packet_data
-        
+
+        # 存储数据包（重复包只覆盖，不重复计数）
+        if not 1 <= packet_num <= session.total_packets:
+            logger.warning(f"数据包序号越界: {packet_num}/{session.total_packets}")
+            return None
+        if session.packets[packet_num - 1] is None:
+            session.received_count += 1
+        session.packets[packet_num - 1] = packet_data
+
         logger.debug(f"接收数据包 {packet_num}/{session.total_packets}, "
                     f"有效字节数: {valid_bytes}")
         
@@ -197,11 +205,8 @@ class RFIDDataParser:
         
     def _handle_data_end(self, data: bytes) -> Optional[Dict]:
         """处理传输结束包"""
-        sequence = data[1]
-        total_packets = data[2]
-        checksum = (data[3] << 8) | data[4]
-        status = data[5]
-        
+        _, sequence, total_packets, checksum, status = _END_STRUCT.unpack_from(data)
+
         session = self.active_sessions.get(sequence)
         if not session:
             logger.warning(f"收到未知序列号的结束包: {sequence}")
@@ -276,21 +281,14 @@ class RFIDDataParser:
         
     def _reassemble_data(self, session: RFIDTransferSession) -> Optional[bytes]:
         """重组分包数据"""
-        if len(session.received_packets) != session.total_packets:
-            logger.error(f"数据包不完整: 收到{len(session.received_packets)}, "
+        if session.received_count != session.total_packets:
+            logger.error(f"数据包不完整: 收到{session.received_count}, "
                         f"期望{session.total_packets}")
             return None
-            
-        # 按包序号排序并拼接
-        data = bytearray()
-        for i in range(1, session.total_packets + 1):
-            if i not in session.received_packets:
-                logger.error(f"缺少数据包: {i}")
-                return None
-            data.extend(session.received_packets[i])
-            
-        # 截取到实际数据长度
-        return bytes(data[:session.data_length])
+
+        # 数据包已按序号落位，一次join完成拼接后截取到实际数据长度
+        data = b''.join(session.packets)
+        return data[:session.data_length]
         
     def _parse_opentag_data(self, data: bytes) -> OpenTagFilamentData:
         """解析OpenTag格式数据
@@ -436,7 +434,7 @@ class RFIDDataParser:
             if current_time - session.start_time > timeout:
                 expired.append(seq)
                 logger.warning(f"清理超时的RFID传输会话: 序列号{seq}, "
-                             f"收到 {len(session.received_packets)}/{session.total_packets} 包")
+                             f"收到 {session.received_count}/{session.total_packets} 包")
                 
         for seq in expired:
             del self.active_sessions[seq]
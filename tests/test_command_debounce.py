@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import AsyncMock
+import feeder_cabinet.can_communication as cc
+from feeder_cabinet.can_communication import FeederCabinetCAN
+
+@pytest.fixture
+def can_comm(monkeypatch):
+    """创建一个不接触硬件的CAN通信实例"""
+    monkeypatch.setattr(FeederCabinetCAN, '_instances', {})
+    comm = FeederCabinetCAN(interface='vcan_test')
+    comm.connected = True
+    comm.bus = object()  # send_message只检查真值
+    comm._send_frame = AsyncMock(return_value=True)
+    return comm
+
+@pytest.mark.asyncio
+async def test_duplicate_command_within_window_coalesced(can_comm):
+    """测试去抖窗口内的重复命令只实际发送一次"""
+    assert await can_comm.send_message(0x01, 0)
+    assert await can_comm.send_message(0x01, 0)
+    can_comm._send_frame.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_different_command_not_coalesced(can_comm):
+    """测试窗口内不同的命令或挤出机不受去抖影响"""
+    await can_comm.send_message(0x01, 0)
+    await can_comm.send_message(0x02, 0)
+    await can_comm.send_message(0x01, 1)
+    assert can_comm._send_frame.await_count == 3
+
+@pytest.mark.asyncio
+async def test_command_resent_after_window(can_comm, monkeypatch):
+    """测试窗口到期后相同命令重新实际发送"""
+    now = [100.0]
+    monkeypatch.setattr(cc.time, "monotonic", lambda: now[0])
+    await can_comm.send_message(0x01, 0)
+    now[0] += can_comm._cmd_debounce_window + 0.001
+    await can_comm.send_message(0x01, 0)
+    assert can_comm._send_frame.await_count == 2
+
+@pytest.mark.asyncio
+async def test_failed_send_does_not_arm_debounce(can_comm):
+    """测试发送失败不会记入去抖状态，重试不被吞掉"""
+    can_comm._send_frame.return_value = False
+    assert not await can_comm.send_message(0x01, 0)
+    can_comm._send_frame.return_value = True
+    assert await can_comm.send_message(0x01, 0)
+    assert can_comm._send_frame.await_count == 2
+
+@pytest.mark.asyncio
+async def test_send_fails_when_disconnected(can_comm):
+    """测试未连接时发送直接失败且不走去抖"""
+    can_comm.connected = False
+    assert not await can_comm.send_message(0x01, 0)
+    can_comm._send_frame.assert_not_awaited()
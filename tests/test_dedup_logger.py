@@ -0,0 +1,81 @@
+import logging
+import pytest
+from unittest.mock import MagicMock
+from feeder_cabinet.can_communication import _DedupLogger
+
+@pytest.fixture
+def mock_logger():
+    """创建一个模拟的logger对象"""
+    return MagicMock()
+
+@pytest.mark.asyncio
+async def test_first_log_passes_through(mock_logger):
+    """测试首次日志正常输出"""
+    dl = _DedupLogger(mock_logger)
+    dl.error("发送失败: %s", "timeout")
+    mock_logger.log.assert_called_once_with(logging.ERROR, "发送失败: %s", "timeout")
+
+@pytest.mark.asyncio
+async def test_repeats_within_window_are_suppressed(mock_logger):
+    """测试窗口内相同模板的重复日志被抑制"""
+    dl = _DedupLogger(mock_logger)
+    for _ in range(5):
+        dl.error("发送失败: %s", "timeout")
+    # 只有第一条实际输出，其余4条被计数抑制
+    mock_logger.log.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_template_change_flushes_summary(mock_logger):
+    """测试模板变化时补记带重复次数的汇总"""
+    dl = _DedupLogger(mock_logger)
+    for _ in range(4):
+        dl.error("发送失败: %s", "timeout")
+    dl.warning("队列已满")
+    calls = mock_logger.log.call_args_list
+    assert len(calls) == 3
+    # 第二条是汇总，消息中带重复次数
+    assert "近期重复 3 次" in calls[1][0][1]
+    assert calls[2][0][1] == "队列已满"
+
+@pytest.mark.asyncio
+async def test_flush_emits_pending_summary(mock_logger):
+    """测试显式flush立即输出挂起的汇总"""
+    dl = _DedupLogger(mock_logger)
+    for _ in range(3):
+        dl.error("发送失败: %s", "timeout")
+    dl.flush()
+    calls = mock_logger.log.call_args_list
+    assert len(calls) == 2
+    assert "近期重复 2 次" in calls[1][0][1]
+
+@pytest.mark.asyncio
+async def test_flush_resets_dedup_state(mock_logger):
+    """测试flush后相同模板的日志重新输出而非被抑制"""
+    dl = _DedupLogger(mock_logger)
+    dl.error("发送失败: %s", "timeout")
+    dl.flush()
+    mock_logger.log.reset_mock()
+    dl.error("发送失败: %s", "timeout")
+    mock_logger.log.assert_called_once_with(logging.ERROR, "发送失败: %s", "timeout")
+
+@pytest.mark.asyncio
+async def test_flush_without_pending_is_noop(mock_logger):
+    """测试没有挂起汇总时flush不产生输出"""
+    dl = _DedupLogger(mock_logger)
+    dl.flush()
+    mock_logger.log.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_window_expiry_flushes_summary(mock_logger, monkeypatch):
+    """测试窗口到期后同一模板也会先补记汇总再输出新日志"""
+    import feeder_cabinet.can_communication as cc
+    now = [100.0]
+    monkeypatch.setattr(cc.time, "monotonic", lambda: now[0])
+    dl = _DedupLogger(mock_logger, window=30.0)
+    for _ in range(3):
+        dl.error("发送失败: %s", "timeout")
+    now[0] += 31.0
+    dl.error("发送失败: %s", "timeout")
+    calls = mock_logger.log.call_args_list
+    assert len(calls) == 3
+    assert "近期重复 2 次" in calls[1][0][1]
@@ -0,0 +1,170 @@
+import struct
+import pytest
+from feeder_cabinet.rfid_parser import (
+    RFIDDataParser,
+    CMD_RFID_RAW_DATA_NOTIFY,
+    CMD_RFID_DATA_PACKET,
+    CMD_RFID_DATA_END,
+    CMD_RFID_READ_ERROR,
+    RFID_ERR_READ_FAIL,
+)
+
+SEQ = 0x01
+EXTRUDER_ID = 0
+FILAMENT_ID = 2
+PACKET_PAYLOAD = 4  # 8字节CAN帧去掉4字节包头后的数据容量
+
+
+def build_payload() -> bytes:
+    """构造一份可被OpenTag解析的原始数据（120字节，30个数据包）"""
+    payload = struct.pack('>H', 1)                      # tag_version
+    payload += b'MINGDA'.ljust(16, b'\x00')             # manufacturer
+    payload += b'PLA'.ljust(16, b'\x00')                # material_name
+    payload += b'White'.ljust(32, b'\x00')              # color_name
+    payload += struct.pack('>HHHHH', 1750, 1000, 210, 60, 1240)
+    payload += b'SN001'.ljust(16, b'\x00')              # serial_number
+    payload += b'\xFF' * (120 - len(payload))           # 可选字段全部留空
+    return payload
+
+
+def build_start(total_packets: int, data_length: int) -> bytes:
+    return struct.pack('>BBBBHBB', CMD_RFID_RAW_DATA_NOTIFY, SEQ,
+                       FILAMENT_ID, total_packets, data_length,
+                       EXTRUDER_ID, 0)
+
+
+def build_packet(packet_num: int, chunk: bytes) -> bytes:
+    frame = bytes([CMD_RFID_DATA_PACKET, SEQ, packet_num, len(chunk)]) + chunk
+    return frame.ljust(8, b'\x00')
+
+
+def build_end(total_packets: int, checksum: int) -> bytes:
+    return struct.pack('>BBBHB', CMD_RFID_DATA_END, SEQ,
+                       total_packets, checksum, 0).ljust(8, b'\x00')
+
+
+def split_packets(payload: bytes):
+    return [payload[i:i + PACKET_PAYLOAD]
+            for i in range(0, len(payload), PACKET_PAYLOAD)]
+
+
+@pytest.fixture
+def parser():
+    return RFIDDataParser()
+
+
+def test_start_frame_creates_session(parser):
+    """测试起始包创建传输会话并返回rfid_start结果"""
+    payload = build_payload()
+    result = parser.handle_rfid_message(build_start(30, len(payload)))
+    assert result == {
+        'type': 'rfid_start',
+        'extruder_id': EXTRUDER_ID,
+        'filament_id': FILAMENT_ID,
+        'data_source': 'rfid',
+    }
+    assert SEQ in parser.active_sessions
+
+
+def test_full_transfer_completes(parser):
+    """测试完整的起始包/数据包/结束包流程并校验解析字段"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    for num, chunk in enumerate(chunks, start=1):
+        result = parser.handle_rfid_message(build_packet(num, chunk))
+        assert result == {
+            'type': 'rfid_packet',
+            'packet_num': num,
+            'total_packets': len(chunks),
+        }
+    result = parser.handle_rfid_message(
+        build_end(len(chunks), sum(payload) & 0xFFFF))
+    assert result['type'] == 'rfid_complete'
+    assert result['extruder_id'] == EXTRUDER_ID
+    assert result['data'].manufacturer == 'MINGDA'
+    assert result['data'].material_name == 'PLA'
+    assert result['data'].color_name == 'White'
+    assert result['data'].print_temp == 210
+    # 完成后会话被清理，数据可按挤出机ID查询
+    assert SEQ not in parser.active_sessions
+    assert parser.get_filament_data(EXTRUDER_ID) is result['data']
+
+
+def test_out_of_order_packets(parser):
+    """测试乱序到达的数据包依然能正确重组"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    for num in reversed(range(1, len(chunks) + 1)):
+        parser.handle_rfid_message(build_packet(num, chunks[num - 1]))
+    result = parser.handle_rfid_message(
+        build_end(len(chunks), sum(payload) & 0xFFFF))
+    assert result['type'] == 'rfid_complete'
+
+
+def test_duplicate_packets_not_double_counted(parser):
+    """测试重复数据包只覆盖不重复计数"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    for num, chunk in enumerate(chunks, start=1):
+        parser.handle_rfid_message(build_packet(num, chunk))
+        parser.handle_rfid_message(build_packet(num, chunk))  # 重发
+    session = parser.active_sessions[SEQ]
+    assert session.received_count == len(chunks)
+    result = parser.handle_rfid_message(
+        build_end(len(chunks), sum(payload) & 0xFFFF))
+    assert result['type'] == 'rfid_complete'
+
+
+def test_out_of_range_packet_number_rejected(parser):
+    """测试越界包序号被拒绝且不影响会话"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    assert parser.handle_rfid_message(build_packet(0, chunks[0])) is None
+    assert parser.handle_rfid_message(
+        build_packet(len(chunks) + 1, chunks[0])) is None
+    assert parser.active_sessions[SEQ].received_count == 0
+
+
+def test_packet_with_unknown_sequence_ignored(parser):
+    """测试未知序列号的数据包被忽略"""
+    assert parser.handle_rfid_message(build_packet(1, b'\x00' * 4)) is None
+
+
+def test_checksum_failure(parser):
+    """测试校验和错误时返回checksum_failed"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    for num, chunk in enumerate(chunks, start=1):
+        parser.handle_rfid_message(build_packet(num, chunk))
+    result = parser.handle_rfid_message(
+        build_end(len(chunks), (sum(payload) + 1) & 0xFFFF))
+    assert result == {'type': 'rfid_error', 'error': 'checksum_failed'}
+
+
+def test_incomplete_transfer_fails_reassembly(parser):
+    """测试缺包时结束包返回reassemble_failed"""
+    payload = build_payload()
+    chunks = split_packets(payload)
+    parser.handle_rfid_message(build_start(len(chunks), len(payload)))
+    for num, chunk in enumerate(chunks[:-1], start=1):  # 少发最后一包
+        parser.handle_rfid_message(build_packet(num, chunk))
+    result = parser.handle_rfid_message(
+        build_end(len(chunks), sum(payload) & 0xFFFF))
+    assert result == {'type': 'rfid_error', 'error': 'reassemble_failed'}
+
+
+def test_error_frame_cleans_session(parser):
+    """测试错误帧返回错误信息并清理对应会话"""
+    payload = build_payload()
+    parser.handle_rfid_message(build_start(30, len(payload)))
+    error_frame = bytes([CMD_RFID_READ_ERROR, SEQ, EXTRUDER_ID,
+                         RFID_ERR_READ_FAIL, 0x00]).ljust(8, b'\x00')
+    result = parser.handle_rfid_message(error_frame)
+    assert result['type'] == 'rfid_error'
+    assert result['error_code'] == RFID_ERR_READ_FAIL
+    assert SEQ not in parser.active_sessions